@@ -179,7 +179,7 @@ def multi_camera_calibration(camera_config, override=False, inspect=False, expor
                          cam_image_list, camera_config['board_dim'], world_points)
                 elif camera_config['board_type'] == 'charuco':
                     # Create the board - world points included
-                    charuco_dict, charuco_board, _ = camera_tools.create_board(camera_config)
+                    charuco_dict, charuco_board = camera_tools.get_charuco_board(camera_config)
                     # Run the calibration:
                     (reprojection_error, camera_matrix,
                      cam_distortion_coefficients) = charuco_calibration(
@@ -408,10 +408,11 @@ def inspect_calibration(camera_config, calibration_config, image_index=None):
 
             # Get new camera matrix
             h, w = example_image.shape[:2]
-            new_cam_mat = cv2.getOptimalNewCameraMatrix(cam_mat, dist_coeffs, (w, h), 1, (w, h))[0]
+            new_cam_mat = camera_tools.get_optimal_new_camera_matrix(
+                cam_mat, dist_coeffs, (w, h))[0]
             if board_type == 'charuco':
                 # Detect the markers
-                charuco_dict, charuco_board, _ = camera_tools.create_board(camera_config)
+                charuco_dict, charuco_board = camera_tools.get_charuco_board(camera_config)
                 corners, ids, rejected_points = cv2.aruco.detectMarkers(example_image, charuco_dict)
                 if ids is not None:
                     # Find the checkerboard corners
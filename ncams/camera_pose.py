@@ -11,6 +11,9 @@ For more details on the camera data structures and dicts, see help(ncams.camera_
 """
 
 import os
+import collections
+import concurrent.futures
+import multiprocessing
 import tkinter
 from tkinter.filedialog import askopenfilename
 
@@ -28,81 +31,237 @@ from . import camera_tools
 
 
 #################### Board detectors
-def charuco_board_detector(camera_config):
+# cv2.aruco objects cannot be pickled, so the detection worker processes rebuild the board once in
+# _init_detection_worker and keep it here. Only used inside the worker processes.
+_worker_charuco_dict = None
+_worker_charuco_board = None
+_worker_detector_parameters = None
+
+
+def _aruco_detector_parameters(aruco3_detection=False):
+    '''Creates aruco detector parameters, optionally with the faster ArUco3 detection enabled.
+
+    ArUco3 downscales the image and skips small candidate contours, which speeds up the detection
+    on high resolution images, but markers shorter than about 32 px plus 5% of the larger image side
+    are no longer found. Older OpenCV versions without ArUco3 keep the default parameters.
+
+    Keyword Arguments:
+        aruco3_detection {bool} -- enable the ArUco3 detection. (default: {False})
+    Output:
+        detector_parameters {cv2.aruco.DetectorParameters} -- parameters for
+            cv2.aruco.detectMarkers.
+    '''
+    if hasattr(cv2.aruco, 'DetectorParameters_create'):
+        detector_parameters = cv2.aruco.DetectorParameters_create()
+    else:
+        detector_parameters = cv2.aruco.DetectorParameters()
+
+    if aruco3_detection and hasattr(detector_parameters, 'useAruco3Detection'):
+        detector_parameters.useAruco3Detection = True
+        detector_parameters.minSideLengthCanonicalImg = 32
+        detector_parameters.minMarkerLengthRatioOriginalImg = 0.05
+
+    return detector_parameters
+
+
+def _load_detection_board(board_config, aruco3_detection=False):
+    '''Creates the charuco dictionary, board and detector parameters used for the detection.
+
+    Arguments:
+        board_config {dict} -- board_dim and check_size from the camera_config.
+    Keyword Arguments:
+        aruco3_detection {bool} -- enable the ArUco3 detection. (default: {False})
+    Output:
+        charuco_dict {cv2.aruco.Dictionary} -- dictionary of the aruco markers.
+        charuco_board {cv2.aruco.CharucoBoard} -- the calibration board.
+        detector_parameters {cv2.aruco.DetectorParameters} -- parameters for
+            cv2.aruco.detectMarkers.
+    '''
+    charuco_dict, charuco_board = camera_tools.get_charuco_board(board_config)
+    return charuco_dict, charuco_board, _aruco_detector_parameters(aruco3_detection)
+
+
+def _init_detection_worker(board_config, aruco3_detection):
+    '''Initializer of the detection worker processes.
+
+    The pool already runs one process per core, so OpenCV is limited to a single thread in each
+    worker to avoid starting a full set of OpenCV threads per process.
+
+    Arguments:
+        board_config {dict} -- board_dim and check_size from the camera_config.
+        aruco3_detection {bool} -- enable the ArUco3 detection.
+    '''
+    global _worker_charuco_dict, _worker_charuco_board, _worker_detector_parameters
+    cv2.setNumThreads(1)
+    (_worker_charuco_dict, _worker_charuco_board,
+     _worker_detector_parameters) = _load_detection_board(board_config, aruco3_detection)
+
+
+def _prefetch_images(image_paths, flags=cv2.IMREAD_COLOR, num_prefetch=4):
+    '''Loads images in background threads ahead of their use.
+
+    Keeps up to num_prefetch reads in flight so that reading from the drive overlaps with processing
+    of the current image. cv2.imread releases the GIL, so threads are sufficient.
+
+    Arguments:
+        image_paths {list of strings} -- images to load, in order.
+    Keyword Arguments:
+        flags {int} -- cv2.imread flags. (default: {cv2.IMREAD_COLOR})
+        num_prefetch {int} -- number of images read ahead. (default: {4})
+    Output:
+        images {generator of np.arrays} -- loaded images in the order of image_paths.
+    '''
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_prefetch) as executor:
+        in_flight = collections.deque()
+        for image_path in image_paths:
+            in_flight.append(executor.submit(cv2.imread, image_path, flags))
+            if len(in_flight) >= num_prefetch:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def _detect_charuco(img, charuco_dict, charuco_board, detector_parameters):
+    '''Detects the charuco corners in a single image.
+
+    Arguments:
+        img {np.array} -- image to search for the board.
+        charuco_dict {cv2.aruco.Dictionary} -- dictionary of the aruco markers.
+        charuco_board {cv2.aruco.CharucoBoard} -- the calibration board.
+        detector_parameters {cv2.aruco.DetectorParameters} -- parameters for
+            cv2.aruco.detectMarkers.
+    Output:
+        charuco_corners {np.array (num_points, 1, 2)} -- x,y coordinates of identified points,
+            empty if none.
+        charuco_ids {np.array (num_points, 1)} -- ids of the points, empty if none.
+    '''
+    # Detect the aruco markers and get IDs
+    corners, ids, _ = cv2.aruco.detectMarkers(img, charuco_dict, parameters=detector_parameters)
+    if ids is not None:
+        # Find the corners and IDs
+        _, charuco_corners, charuco_ids = cv2.aruco.interpolateCornersCharuco(
+            corners, ids, img, charuco_board)
+        if isinstance(charuco_corners, np.ndarray):  # If present then return
+            return charuco_corners, charuco_ids
+    # Empty arrays of the same layout, so that the output can be indexed without type checks
+    return np.empty((0, 1, 2), dtype=np.float32), np.empty((0, 1), dtype=np.int32)
+
+
+def _detect_charuco_one(task):
+    '''Loads an image and detects the charuco corners in it. Used by the detection worker processes
+    with the board created by _init_detection_worker.
+
+    Arguments:
+        task {tuple (iimage, icam, image_path)} -- index of the image, index of the camera and the
+            image file to load.
+    Output:
+        iimage {int} -- index of the image.
+        icam {int} -- index of the camera.
+        charuco_corners {np.array (num_points, 1, 2)} -- x,y coordinates of identified points,
+            empty if none.
+        charuco_ids {np.array (num_points, 1)} -- ids of the points, empty if none.
+    '''
+    iimage, icam, image_path = task
+    # Detection only needs a single channel
+    charuco_corners, charuco_ids = _detect_charuco(
+        cv2.imread(image_path, cv2.IMREAD_GRAYSCALE), _worker_charuco_dict, _worker_charuco_board,
+        _worker_detector_parameters)
+    return iimage, icam, charuco_corners, charuco_ids
+
+
+def charuco_board_detector(camera_config, num_processes=1, aruco3_detection=False):
     '''Detects charuco board in all cameras.
 
     (Should be run after cameras have been calibrated.)
     A general function for bulk identifying all charuco corners across cameras and storing them in
-    usable arrays for subsequent pose estimation.
+    usable arrays for subsequent pose estimation. Images can be processed in parallel by several
+    processes. The worker processes import the calling script again on platforms that spawn them
+    (Windows, macOS), so the script has to call this function under
+    `if __name__ == '__main__':` when num_processes is not 1.
 
     Arguments:
         camera_config {dict} -- see help(ncams.camera_tools). Should have following keys:
             serials {list of numbers} -- list of camera serials.
             dicts {dict of 'camera_dict's} -- keys are serials, values are 'camera_dict'.
+            board_type {'checkerboard' or 'charuco'} -- what type of board was used for calibration.
+            board_dim {list with 2 numbers} -- number of checks on the calibration board.
+            check_size {number} -- height and width of a single check mark, mm.
             pose_estimation_path {string} -- relative path to where pose estimation information is
                 stored from 'setup_path'.
+    Keyword Arguments:
+        num_processes {int} -- number of worker processes for the detection, at most one per
+            image. If 1, the detection runs in the calling process. If None, uses the number of
+            CPUs. (default: {1})
+        aruco3_detection {bool} -- use the faster ArUco3 marker detection, which misses markers
+            shorter than about 32 px plus 5% of the larger image side. Check that the board is
+            still detected before enabling it. (default: {False})
 
     Output:
-        cam_image_points {list} -- x,y coordinates of identified points
-        cam_charuco_ids {list} -- ids of the points
+        cam_image_points {np.array of objects (num_images, num_cameras)} -- x,y coordinates of
+            identified points in each image of each camera.
+        cam_charuco_ids {np.array of objects (num_images, num_cameras)} -- ids of the points.
     '''
     # Unpack the dict
     serials = camera_config['serials']
     names = [camera_config['dicts'][serial]['name'] for serial in serials]
     pose_estimation_path = os.path.join(camera_config['setup_path'],
                                         camera_config['pose_estimation_path'])
+    # Only the board description is sent to the workers, the rest of the config may not pickle
+    board_config = {key: camera_config[key] for key in ('board_dim', 'check_size')}
 
     # Get number of cameras
     num_cameras = len(serials)
-    charuco_dict, charuco_board, _ = camera_tools.create_board(camera_config)
 
     # Get list of images for each camera
+    # Cameras without their own folder have their images in pose_estimation_path, which is then
+    # scanned only once. The folders are scanned concurrently.
+    path_checks = [os.path.isdir(os.path.join(pose_estimation_path, name)) for name in names]
+    cam_image_dirs = [os.path.join(pose_estimation_path, name) if path_check
+                      else pose_estimation_path
+                      for name, path_check in zip(names, path_checks)]
+    image_dirs = list(dict.fromkeys(cam_image_dirs))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(image_dirs))) as executor:
+        dir_image_lists = dict(zip(image_dirs, executor.map(utils.get_image_list, image_dirs)))
+
     cam_image_list = []
-    num_images = np.zeros((1, num_cameras), dtype=int)
-    for icam, name in enumerate(names):
-        path_check = os.path.isdir(os.path.join(pose_estimation_path, name))
+    for name, path_check, image_dir in zip(names, path_checks, cam_image_dirs):
+        image_list = dir_image_lists[image_dir]
         if path_check is False:
-            full_image_list = utils.get_image_list(path=os.path.join(pose_estimation_path))
-            image_list = [fn for fn in full_image_list if name in fn]
-        else:
-            image_list = utils.get_image_list(path=os.path.join(pose_estimation_path, name))
+            image_list = [fn for fn in image_list if name in fn]
 
-        num_images[0, icam] = len(image_list)
         cam_image_list.append(image_list)
 
     # Crucial: each camera must have the same number of images so that we can assume the order is
     # maintained and that they are synced
-    if not np.ma.allequal(num_images, np.mean(num_images)):
+    num_images = [len(image_list) for image_list in cam_image_list]
+    if len(set(num_images)) > 1:
         raise Exception('Image lists are of unequal size and may not be synced.')
 
-    num_images = num_images[0, 0]
-    cam_image_points = []
-    cam_charuco_ids = []
-    # Look at one synced image across cameras and find the points
-    for image in range(num_images):
-        im_ids, image_points = [], []  # reset for each image
-        for icam, name in enumerate(names):
-            # Load the image
-            img = cv2.imread(os.path.join(pose_estimation_path, name,
-                                          cam_image_list[icam][image]))
-            # Detect the aruco markers and get IDs
-            corners, ids, _ = cv2.aruco.detectMarkers(img, charuco_dict)
-            if ids is not None:
-                # Find the corners and IDs
-                _, charuco_corners, charuco_ids = cv2.aruco.interpolateCornersCharuco(
-                    corners, ids, img, charuco_board)
-                if isinstance(charuco_corners, np.ndarray):  # If present then append
-                    image_points.append(charuco_corners)
-                    im_ids.append(charuco_ids)
-                else:  # For formatting/indexing
-                    image_points.append([])
-                    im_ids.append([])
-            else:
-                image_points.append([])
-                im_ids.append([])
-        # Concatenate them to get super list which can be parsed later
-        cam_image_points.append(image_points)
-        cam_charuco_ids.append(im_ids)
+    num_images = num_images[0]
+    # One task per synced image per camera, the results are placed back by their indices
+    tasks = [(image, icam, cam_image_list[icam][image])
+             for image in range(num_images) for icam in range(num_cameras)]
+    if num_processes is None:
+        num_processes = os.cpu_count()
+    num_processes = min(num_processes, len(tasks))
+    if num_processes <= 1:
+        detection_board = _load_detection_board(board_config, aruco3_detection)
+        # Read the next images while the current one is being processed
+        images = _prefetch_images([image_path for _, _, image_path in tasks],
+                                  cv2.IMREAD_GRAYSCALE)
+        detections = [(image, icam) + _detect_charuco(img, *detection_board)
+                      for (image, icam, _), img in zip(tasks, images)]
+    else:
+        with multiprocessing.Pool(processes=num_processes, initializer=_init_detection_worker,
+                                  initargs=(board_config, aruco3_detection)) as pool:
+            detections = list(pool.imap_unordered(_detect_charuco_one, tasks, chunksize=4))
+
+    # Arrays indexed [image, camera] which can be parsed later
+    cam_image_points = np.empty((num_images, num_cameras), dtype=object)
+    cam_charuco_ids = np.empty((num_images, num_cameras), dtype=object)
+    for image, icam, charuco_corners, charuco_ids in detections:
+        cam_image_points[image, icam] = charuco_corners
+        cam_charuco_ids[image, icam] = charuco_ids
 
     return cam_image_points, cam_charuco_ids
 
@@ -137,7 +296,9 @@ def checkerboard_detector(camera_config):
     board_dim = camera_config['board_dim']
 
     # Begin the checkerboard detection for each camera
-    criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001) # Default criteria
+    # The sector based detector is multithreaded and already refines the corners to subpixel
+    # accuracy, so no cornerSubPix is needed
+    sb_flags = cv2.CALIB_CB_NORMALIZE_IMAGE | cv2.CALIB_CB_EXHAUSTIVE | cv2.CALIB_CB_ACCURACY
     cam_board_logit = []
     cam_image_points = []
 
@@ -150,15 +311,14 @@ def checkerboard_detector(camera_config):
         image_points = []  # x,y image points
         board_logit = np.zeros((1, len(cam_image_list)), dtype=bool)
 
-        for iimage, image_name in enumerate(cam_image_list):
-            img = cv2.imread(image_name, 0) # Load as grayscale
-            board_logit[0, iimage], corners = cv2.findChessboardCorners(
-                img, (board_dim[0]-1, board_dim[1]-1), None)
+        # Load as grayscale, reading the next images while the current one is being processed
+        for iimage, img in enumerate(_prefetch_images(cam_image_list, cv2.IMREAD_GRAYSCALE)):
+            board_logit[0, iimage], corners = cv2.findChessboardCornersSB(
+                img, (board_dim[0]-1, board_dim[1]-1), flags=sb_flags)
 
             # If a checkerboard was found then append the image points variable for calibration
             if board_logit[0, iimage]:
-                corners_refined = cv2.cornerSubPix(img, corners, (11, 11), (-1, -1), criteria)
-                image_points.append(corners_refined)
+                image_points.append(corners)
             else:
                 image_points.append([]) # To keep consistent with the board_logit list
 
@@ -230,13 +390,39 @@ def get_optimal_pose_method(input_array, board_type, num_corners):
     return optimal_method
 
 
+def _shared_point_logit(cam_charuco_ids, num_corners, num_cameras):
+    '''Marks which corners of the board each camera detected in each image.
+
+    Arguments:
+        cam_charuco_ids {np.array of objects (num_images, num_cameras)} -- ids of the detected
+            points for each image and camera, as output by charuco_board_detector.
+        num_corners {int} -- number of corners on the board.
+        num_cameras {int} -- number of cameras.
+    Output:
+        point_logit {np.array (num_images, num_corners, num_cameras)} -- True where the corner was
+            detected.
+    '''
+    num_images = len(cam_charuco_ids)
+    # Flatten the detections of all images and cameras so that the table is filled at once
+    ids_list = [np.ravel(ids) for im_ids in cam_charuco_ids for ids in im_ids]
+    num_ids = [len(ids) for ids in ids_list]
+    corner_ids = np.concatenate(ids_list).astype(int)
+    image_idx = np.repeat(np.repeat(np.arange(num_images), num_cameras), num_ids)
+    cam_idx = np.repeat(np.tile(np.arange(num_cameras), num_images), num_ids)
+
+    point_logit = np.zeros((num_images, num_corners, num_cameras), dtype=bool)
+    point_logit[image_idx, corner_ids, cam_idx] = True
+
+    return point_logit
+
+
 #################### Pose estimation methods
 def get_world_pose(image, image_size, charuco_dict, charuco_board, world_points, camera_matrix,
-                   cam_distortion_coefficients):
+                   cam_distortion_coefficients, detector_parameters=None):
     (w,h) = image_size
     # Get the image points
     # Detect the aruco markers and IDs
-    corners, ids, _ = cv2.aruco.detectMarkers(image, charuco_dict)
+    corners, ids, _ = cv2.aruco.detectMarkers(image, charuco_dict, parameters=detector_parameters)
     _, charuco_corners, charuco_ids = cv2.aruco.interpolateCornersCharuco(
         corners, ids, image, charuco_board)
     # Match to world points
@@ -253,13 +439,39 @@ def get_world_pose(image, image_size, charuco_dict, charuco_board, world_points,
     return camera_location, cam_orientation
 
 
-def one_shot_multi_PnP(camera_config, calibration_config, export_full=True, show_poses=False):
+def _pose_one_camera(task):
+    '''Estimates the pose of a single camera from its image of the board.
+
+    Used by the worker processes of one_shot_multi_PnP with the board created by
+    _init_detection_worker.
+
+    Arguments:
+        task {tuple (im_path, image_size, world_points, camera_matrix,
+                     cam_distortion_coefficients)} -- image file of the board, (width, height) of
+            the image, world points of the board and the calibration of the camera.
+    Output:
+        camera_location {np.array} -- world location of the camera.
+        cam_orientation {np.array} -- world orientation of the camera.
+    '''
+    im_path, image_size, world_points, camera_matrix, cam_distortion_coefficients = task
+    world_image = cv2.imread(im_path, cv2.IMREAD_GRAYSCALE)  # Color is not used
+
+    return get_world_pose(world_image, image_size, _worker_charuco_dict, _worker_charuco_board,
+                          world_points, camera_matrix, cam_distortion_coefficients,
+                          detector_parameters=_worker_detector_parameters)
+
+
+def one_shot_multi_PnP(camera_config, calibration_config, export_full=True, show_poses=False,
+                       num_processes=1, aruco3_detection=False):
     '''Position estimation based on a single frame from each camera.
 
     Assumes that a single synchronized image was taken where all cameras can see the calibration
     board. Will then use the world points to compute the position of each camera independently.
     This method utilizes the fewest images and points to compute the positions and orientations but
-    is also the simplest to implement.
+    is also the simplest to implement. The cameras can be processed in parallel by several
+    processes. The worker processes import the calling script again on platforms that spawn them
+    (Windows, macOS), so the script has to call this function under
+    `if __name__ == '__main__':` when num_processes is not 1.
 
     Arguments:
         camera_config {dict} -- see help(ncams.camera_tools). Should have following keys:
@@ -275,6 +487,12 @@ def one_shot_multi_PnP(camera_config, calibration_config, export_full=True, show
                 'camera_calib_dict', see below.
     Keyword Arguments:
         export_full {bool} -- save the pose estimation to a dedicated file. (default: {True})
+        show_poses {bool} -- plot the estimated poses. (default: {False})
+        num_processes {int} -- number of worker processes, at most one per camera. If 1, runs in
+            the calling process. If None, uses the number of CPUs. (default: {1})
+        aruco3_detection {bool} -- use the faster ArUco3 marker detection, which misses markers
+            shorter than about 32 px plus 5% of the larger image side. Check that the board is
+            still detected before enabling it. (default: {False})
     Output:
         pose_estimation_config {dict} -- information on estimation of relative position of all
                 cameras and the results of said pose estimation. For more info, see
@@ -300,14 +518,14 @@ def one_shot_multi_PnP(camera_config, calibration_config, export_full=True, show
     camera_matrices = calibration_config['camera_matrices']
     distortion_coefficients = calibration_config['distortion_coefficients']
 
-    charuco_dict, charuco_board, _ = camera_tools.create_board(camera_config)
+    # Only the board description is sent to the workers, the rest of the config may not pickle
+    board_config = {key: camera_config[key] for key in ('board_dim', 'check_size')}
     world_points = camera_tools.create_world_points(camera_config)
     h, w = camera_config['image_size']
     im_list = utils.get_image_list(path=pose_estimation_path)
 
-    world_locations = []
-    world_orientations = []
-    for icam, name in enumerate(names):
+    im_paths = []
+    for name in names:
         # Find the correct image
         im_name = [i for i in im_list if name in i]
         # If more than one image contains the camera name ask user to select
@@ -324,15 +542,31 @@ def one_shot_multi_PnP(camera_config, calibration_config, export_full=True, show
         else:
             im_path = os.path.join(pose_estimation_path, im_name[0])
 
-        world_image = cv2.imread(im_path)
-
-        cam_location, cam_orientation = get_world_pose(world_image, (w, h), charuco_dict,
-                                                       charuco_board, world_points,
-                                                       camera_matrices[icam],
-                                                       distortion_coefficients[icam])
-
-        world_locations.append(cam_location)
-        world_orientations.append(cam_orientation)
+        im_paths.append(im_path)
+
+    # The pose of each camera is computed independently, so the cameras can be split between
+    # processes
+    tasks = [(im_path, (w, h), world_points, camera_matrix, cam_distortion_coefficients)
+             for im_path, camera_matrix, cam_distortion_coefficients in zip(
+                 im_paths, camera_matrices, distortion_coefficients)]
+    if num_processes is None:
+        num_processes = os.cpu_count()
+    num_processes = min(num_processes, len(tasks))
+    if num_processes <= 1:
+        charuco_dict, charuco_board, detector_parameters = _load_detection_board(
+            board_config, aruco3_detection)
+        poses = [get_world_pose(cv2.imread(im_path, cv2.IMREAD_GRAYSCALE), image_size,
+                                charuco_dict, charuco_board, world_points, camera_matrix,
+                                cam_distortion_coefficients,
+                                detector_parameters=detector_parameters)
+                 for (im_path, image_size, world_points, camera_matrix,
+                      cam_distortion_coefficients) in tasks]
+    else:
+        with multiprocessing.Pool(processes=num_processes, initializer=_init_detection_worker,
+                                  initargs=(board_config, aruco3_detection)) as pool:
+            poses = pool.map(_pose_one_camera, tasks)
+    world_locations = [cam_location for cam_location, _ in poses]
+    world_orientations = [cam_orientation for _, cam_orientation in poses]
 
     # Make the output structure
     dicts = {}
@@ -385,8 +619,10 @@ def common_pose_estimation(camera_config, calibration_config, cam_image_points,
             camera_matrices {list of np.arrays} -- the essential camera matrix for each camera.
             dicts {dict of 'camera_calib_dict's} -- keys are serials, values are
                 'camera_calib_dict', see below.
-        cam_image_points {[type]} -- [description]
-        detection_logit {[type]} -- [description]
+        cam_image_points {np.array of objects (num_images, num_cameras)} -- x,y coordinates of
+            identified points, as output by charuco_board_detector.
+        detection_logit {np.array of objects (num_images, num_cameras)} -- ids of the points, as
+            output by charuco_board_detector.
     Keyword Arguments:
         export_full {bool} -- save the pose estimation to a dedicated file. (default: {True})
     Output:
@@ -421,49 +657,53 @@ def common_pose_estimation(camera_config, calibration_config, cam_image_points,
     secondary_idx = cam_idx[cam_idx != ireference_cam] # Get the indices of the non-primary cameras
     # Get the world points
     world_points = camera_tools.create_world_points(camera_config)
-    corner_idx = np.arange(0, len(world_points))
+    corner_idx = np.arange(0, len(world_points), dtype=np.int32)
 
     if camera_config['board_type'] == 'charuco':
         # Get all the points shared across cameras
         filtered_object_points = []
         filtered_image_points = [[] for icam in range(num_cameras)]
-        for cip, detl in zip(cam_image_points, detection_logit):
-            # Empty array with a spot for each corner and ID
-            point_logit = np.zeros((len(world_points), num_cameras), dtype=bool)
-            for icam in range(num_cameras):
-                temp = detl[icam]  # Get the array specific to the camera and im
-                if isinstance(temp, np.ndarray):
-                    for corner in temp:  # For each detected corner
-                        point_logit[int(corner), icam] = True
-            sum_point_logit = np.sum(point_logit.astype(int), 1)
-
-            # Find which points are shared across all cameras
-            common_points = sum_point_logit == num_cameras
-            if np.sum(common_points) >= 6:
-                # Append only those points
-                filtered_object_points.append(world_points[common_points, :].astype('float32'))
+        # Spot for each image, corner and camera
+        point_logit = _shared_point_logit(detection_logit, len(world_points), num_cameras)
+
+        # Find which points are shared across all cameras
+        all_common_points = point_logit.all(axis=2)
+        # Row of each detected corner in a camera's points, indexed by the corner ID. Only the
+        # common corners are looked up and those are written for every camera, so the table is
+        # reused without resetting
+        id_to_row = np.zeros(len(world_points), dtype=np.intp)
+        world_points_float32 = world_points.astype('float32')
+        object_points, previous_common_idx = None, None
+        for cip, detl, common_points in zip(cam_image_points, detection_logit, all_common_points):
+            # Gather table of the shared corners
+            common_idx = corner_idx[common_points]
+            if len(common_idx) >= 6:
+                # Append only those points. The board is often fully visible, so the object points
+                # of the previous image are reused when the same corners are shared.
+                if not np.array_equal(common_idx, previous_common_idx):
+                    object_points = world_points_float32[common_idx]
+                    previous_common_idx = common_idx
+                filtered_object_points.append(object_points)
                 for icam in range(num_cameras):
-                    temp_corners = np.zeros((np.sum(common_points), 2), dtype=float)
-                    temp_ids = detl[icam]
-                    temp_points = cip[icam]
-                    running_idx = 0
-                    for corner in corner_idx[common_points]:  # Only append
-                        idx = int(np.where(temp_ids == corner)[0])
-                        temp_corners[running_idx, :] = temp_points[idx, :, :]
-                        running_idx += 1
+                    temp_ids = detl[icam].ravel()
+                    id_to_row[temp_ids] = np.arange(len(temp_ids))
+                    temp_corners = cip[icam][id_to_row[common_idx], 0, :]
                     filtered_image_points[icam].append(temp_corners.astype('float32'))
 
     elif camera_config['board_type'] == 'checkerboard':
         raise NotImplementedError
 
+    # All shared points of each camera in one array
+    stacked_image_points = [np.vstack(pts) for pts in filtered_image_points]
+
     # Get the optimal matrices and undistorted points
     optimal_matrices, undistorted_points = [], []
     for icam in range(num_cameras):
-        temp_optim, _ = cv2.getOptimalNewCameraMatrix(
-            camera_matrices[icam], distortion_coefficients[icam], (w, h), 1, (w, h))
+        temp_optim, _ = camera_tools.get_optimal_new_camera_matrix(
+            camera_matrices[icam], distortion_coefficients[icam], (w, h))
         optimal_matrices.append(temp_optim)
         undistorted_points.append(cv2.undistortPoints(
-            np.vstack(filtered_image_points[icam]), camera_matrices[icam],
+            stacked_image_points[icam], camera_matrices[icam],
             distortion_coefficients[icam], P=optimal_matrices[icam]))
 
     # Perform the initial stereo calibration
@@ -494,19 +734,17 @@ def common_pose_estimation(camera_config, calibration_config, cam_image_points,
     triangulated_points_norm = cv2.triangulatePoints(
         projection_matrix_primary, projection_matrix_secondary,
         undistorted_points[ireference_cam], undistorted_points[secondary_cam])
-    # Normalize:
-    triangulated_points = triangulated_points_norm[:3, :] / np.transpose(
-        np.repeat(triangulated_points_norm[3, :], 3).reshape((-1, 3)))
+    # Normalize into contiguous N x 3 points as used by solvePnP:
+    triangulated_points = np.ascontiguousarray(
+        (triangulated_points_norm[:3, :] / triangulated_points_norm[3:4, :]).T)
 
-    world_orientations = []
-    world_locations = []
     # Get pose from the triangulated points for all cameras
-    for icam in range(num_cameras):
-        _, rvec, tvec = cv2.solvePnP(
-            np.transpose(triangulated_points), np.vstack(filtered_image_points[icam]),
-            camera_matrices[icam], distortion_coefficients[icam])
-        world_orientations.append(rvec)
-        world_locations.append(tvec)
+    # The cameras are solved in parallel threads, solvePnP releases the GIL
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_cameras) as executor:
+        poses = list(executor.map(cv2.solvePnP, [triangulated_points] * num_cameras,
+                                  stacked_image_points, camera_matrices, distortion_coefficients))
+    world_orientations = [rvec for _, rvec, _ in poses]
+    world_locations = [tvec for _, _, tvec in poses]
 
     # Make the output structure
     dicts = {}
@@ -635,8 +873,9 @@ def inspect_pose_estimation():
                                                cam_names[cam_indices[1]], im_list2[image_index]))
 
     # Detect the markers
-    corners1, ids1, _ = cv2.aruco.detectMarkers(im1, charuco_dict)
-    corners2, ids2, _ = cv2.aruco.detectMarkers(im2, charuco_dict)
+    detector_parameters = _aruco_detector_parameters()
+    corners1, ids1, _ = cv2.aruco.detectMarkers(im1, charuco_dict, parameters=detector_parameters)
+    corners2, ids2, _ = cv2.aruco.detectMarkers(im2, charuco_dict, parameters=detector_parameters)
     # Get the chessboard
     _, charuco_corners1, charuco_ids1 = cv2.aruco.interpolateCornersCharuco(corners1, ids1, im1, charuco_board)
     _, charuco_corners2, charuco_ids2 = cv2.aruco.interpolateCornersCharuco(corners2, ids2, im2, charuco_board)
@@ -667,15 +906,15 @@ def inspect_pose_estimation():
     projection_secondary = np.matmul(camera_matrices[1],np.hstack((R, T)))
 
     # Now lets try to triangulate these shared points
-    new_cam_mat1, _ = cv2.getOptimalNewCameraMatrix(camera_matrices[cam_indices[0]], distortion_coefficients[cam_indices[0]], (w,h), 1, (w,h))
+    new_cam_mat1, _ = camera_tools.get_optimal_new_camera_matrix(camera_matrices[cam_indices[0]], distortion_coefficients[cam_indices[0]], (w,h))
     undistorted_points1 = cv2.undistortPoints(np.vstack(shared_corners1), camera_matrices[cam_indices[0]], distortion_coefficients[cam_indices[0]], P = new_cam_mat1)
 
-    new_cam_mat2, _ = cv2.getOptimalNewCameraMatrix(camera_matrices[cam_indices[1]], distortion_coefficients[cam_indices[1]], (w,h), 1, (w,h))
+    new_cam_mat2, _ = camera_tools.get_optimal_new_camera_matrix(camera_matrices[cam_indices[1]], distortion_coefficients[cam_indices[1]], (w,h))
     undistorted_points2 = cv2.undistortPoints(np.vstack(shared_corners2), camera_matrices[cam_indices[1]], distortion_coefficients[cam_indices[1]], P = new_cam_mat2)
 
     # Triangulate the points
     triangulated_points_norm = cv2.triangulatePoints(projection_primary, projection_secondary, undistorted_points1, undistorted_points2)
-    triangulated_points = triangulated_points_norm[:3,:]/np.transpose(np.repeat(triangulated_points_norm[3,:], 3).reshape((-1,3)))
+    triangulated_points = triangulated_points_norm[:3,:]/triangulated_points_norm[3:4,:]
 
     # Reproject the points to each camera and verify
     reprojected_corners1,_ = cv2.projectPoints(triangulated_points, np.identity(3), np.zeros((3,1)),
@@ -686,12 +925,11 @@ def inspect_pose_estimation():
     fig, axs = matplotlib.pyplot.subplots(1,2, squeeze=False)
     axs[0,0].imshow(im1)
     axs[0,1].imshow(im2)
-    for corner in range(len(shared_corners1)):
-        axs[0,0].scatter(shared_corners1[corner, 0, 0], shared_corners1[corner, 0, 1], facecolors='none', edgecolors='b')
-        axs[0,0].scatter(shared_corners1[corner, 0, 0], reprojected_corners1[corner, 0, 1], facecolors='none', edgecolors='r')
+    axs[0,0].scatter(shared_corners1[:, 0, 0], shared_corners1[:, 0, 1], facecolors='none', edgecolors='b')
+    axs[0,0].scatter(shared_corners1[:, 0, 0], reprojected_corners1[:, 0, 1], facecolors='none', edgecolors='r')
 
-        axs[0,1].scatter(shared_corners2[corner, 0, 0], shared_corners2[corner, 0, 1], facecolors='none', edgecolors='b')
-        axs[0,1].scatter(shared_corners2[corner, 0, 0], reprojected_corners2[corner, 0, 1], facecolors='none', edgecolors='r')
+    axs[0,1].scatter(shared_corners2[:, 0, 0], shared_corners2[:, 0, 1], facecolors='none', edgecolors='b')
+    axs[0,1].scatter(shared_corners2[:, 0, 0], reprojected_corners2[:, 0, 1], facecolors='none', edgecolors='r')
 
 
 def plot_poses(pose_estimation_config, scale_factor=1):
@@ -721,28 +959,26 @@ def plot_poses(pose_estimation_config, scale_factor=1):
 
     # Create a figure with axes
     fig = mpl_pp.figure()
-    ax = fig.gca(projection='3d')
+    ax = fig.add_subplot(111, projection='3d')
 
-    # Keep the verts for setting the axes later
-    cam_verts = [[] for _ in range(num_cameras)]
-    for icam in range(num_cameras):
-        # Get the vertices to plot appropriate to the translation and rotation
-        cam_verts[icam], cam_center = create_camera(
-            scale_factor=scale_factor,
-            rotation_vector=world_orientations[icam],
-            translation_vector=world_locations[icam])
+    # Move the camera shape to the pose of every camera at once
+    # Vertices (num_cameras, 9, 4, 3) & label positions (num_cameras, 3)
+    cam_verts, cam_centers = _create_cameras(scale_factor, world_orientations, world_locations)
 
-        # Plot it and change the color according to it's number
-        ax.add_collection3d(Poly3DCollection(
-            cam_verts[icam], facecolors='C'+str(icam), linewidths=1, edgecolors='k', alpha=1))
+    # Plot all cameras as one collection and change the color according to their number
+    cam_colors = matplotlib.colors.to_rgba_array(['C'+str(icam) for icam in range(num_cameras)])
+    face_colors = np.repeat(cam_colors, len(_CAM_FACE_IDX), axis=0)
+    ax.add_collection3d(Poly3DCollection(
+        cam_verts.reshape(-1, 4, 3), facecolors=face_colors, linewidths=1, edgecolors='k',
+        alpha=1))
 
+    for icam in range(num_cameras):
         # Give each camera a label
-        ax.text(np.asscalar(cam_center[0]), np.asscalar(cam_center[1]), np.asscalar(cam_center[2]),
-                'Cam ' + str(serials[icam]))
+        cx, cy, cz = map(float, cam_centers[icam])
+        ax.text(cx, cy, cz, 'Cam {}'.format(serials[icam]))
 
     # mpl is weird about maintaining aspect ratios so this has to be done
-    ax_min = np.min(np.hstack(cam_verts))
-    ax_max = np.max(np.hstack(cam_verts))
+    ax_min, ax_max = cam_verts.min(), cam_verts.max()
 
     # Set the axes and viewing angle
     # Note that this is reversed so that the cameras are looking towards us
@@ -757,6 +993,23 @@ def plot_poses(pose_estimation_config, scale_factor=1):
 
 
 #################### Camera plotting helper functions
+# Typical camera shape with the origin at the back of the lens. Rows:
+# Back of camera body
+#  Front of camera body/back of lens
+# Back of camera body
+_CAM_TEMPLATE = np.array([
+    [0, 0, 0],       [1, 0, 0],       [1, 1, 0],       [0, 1, 0],
+    [0.2, 0.2, 0.5], [0.8, 0.2, 0.5], [0.8, 0.8, 0.5], [0.2, 0.8, 0.5],
+    [0.2, 0.2, 1],   [0.8, 0.2, 1],   [0.8, 0.8, 1],   [0.2, 0.8, 1]],
+    dtype=np.float64) - np.array([0.5, 0.5, 0.5])
+
+# Indices of the camera points in create_camera that make up each face of the camera
+_CAM_FACE_IDX = np.array([
+    [0, 4, 5, 1], [1, 5, 6, 2], [2, 6, 7, 3], [3, 7, 4, 0],  # Sides of lenses
+    [4, 8, 9, 5], [5, 9, 10, 6], [6, 10, 11, 7], [7, 11, 8, 4],  # Sides of body
+    [8, 9, 10, 11]], dtype=np.intp)  # Back of body
+
+
 def create_camera(scale_factor=1, rotation_vector=None, translation_vector=None):
     '''Create a typical camera shape.
 
@@ -767,34 +1020,40 @@ def create_camera(scale_factor=1, rotation_vector=None, translation_vector=None)
         rotation_vector {[type]} -- [description] (default: {None})
         translation_vector {[type]} -- [description] (default: {None})
     Output:
-        camera_vertices {np.array} -- [description]
+        camera_vertices {np.array 9x4x3} -- vertices of each face of the camera.
         cam_center {np.array} -- [description]
     '''
-    # Lines:
-    # Back of camera body
-    #  Front of camera body/back of lens
-    # Back of camera body
-    cam_points = np.array([
-        [0, 0, 0],       [1, 0, 0],       [1, 1, 0],       [0, 1, 0],
-        [0.2, 0.2, 0.5], [0.8, 0.2, 0.5], [0.8, 0.8, 0.5], [0.2, 0.8, 0.5],
-        [0.2, 0.2, 1],   [0.8, 0.2, 1],   [0.8, 0.8, 1],   [0.2, 0.8, 1]])
-
-    # Set the origin as the back of the lens
-    centering_vector = [0.5, 0.5, 0.5]
-    cam_points = cam_points - centering_vector
+    cam_verts, cam_centers = _create_cameras(scale_factor, [rotation_vector], [translation_vector])
+
+    return cam_verts[0], cam_centers[0]
 
+
+def _create_cameras(scale_factor, rotation_vectors, translation_vectors):
+    '''Creates the camera shape in the pose of each camera.
+
+    Arguments:
+        scale_factor {number} -- size of the camera shape.
+        rotation_vectors {list of np.arrays} -- rotation vector or matrix of each camera, None for
+            no rotation.
+        translation_vectors {list of np.arrays} -- translation vector of each camera, None for no
+            translation.
+    Output:
+        cam_verts {np.array (num_cameras, 9, 4, 3)} -- vertices of each face of each camera.
+        cam_centers {np.array (num_cameras, 3)} -- position of the label of each camera.
+    '''
     # Scale the points
-    cam_points = cam_points * scale_factor
+    cam_points = _CAM_TEMPLATE * scale_factor
 
     # Move the camera
-    cam_points = move_camera(cam_points, rotation_vector, translation_vector)
+    rotation_matrices, offsets = _prep_extrinsics(rotation_vectors, translation_vectors)
+    cam_points = _apply_extrinsics(cam_points, rotation_matrices, offsets)
 
-    # Get the vertices & center
-    camera_vertices = get_camera_vertices(cam_points)
-    cam_center = np.mean(cam_points[4:8, :], 0)
-    cam_center[1] = cam_center[1] + scale_factor
+    # Get the vertices & centers
+    cam_verts = get_camera_vertices(cam_points)
+    cam_centers = cam_points[:, 4:8].mean(axis=1)
+    cam_centers[:, 1] = cam_centers[:, 1] + scale_factor
 
-    return camera_vertices, cam_center
+    return cam_verts, cam_centers
 
 
 def move_camera(cam_points, rotation_vector=None, translation_vector=None):
@@ -809,26 +1068,50 @@ def move_camera(cam_points, rotation_vector=None, translation_vector=None):
         rotation_vector {np.array} -- [description] (default: {None})
         translation_vector {np.array} -- [description] (default: {None})
     '''
-    # Check rotation vector format
-    if rotation_vector is None:
-        rotation_vector = np.identity(3) # Assume it's not rotating
-    elif rotation_vector.shape == (3, 1) or rotation_vector.shape == (1, 3):
-        # Make matrix if necessary
-        rotation_vector = cv2.Rodrigues(rotation_vector)[0] # Convert to matrix
+    rotation_matrices, offsets = _prep_extrinsics([rotation_vector], [translation_vector])
+
+    return _apply_extrinsics(cam_points, rotation_matrices, offsets)[0]
+
+
+def _prep_extrinsics(rotation_vectors, translation_vectors):
+    '''Converts the camera poses into the terms of the transform applied by _apply_extrinsics.
+
+    Arguments:
+        rotation_vectors {list of np.arrays} -- rotation vector or matrix of each camera, None for
+            no rotation.
+        translation_vectors {list of np.arrays} -- translation vector of each camera, None for no
+            translation.
+    Output:
+        rotation_matrices {np.array (num_cameras, 3, 3)} -- rotation matrix of each camera.
+        offsets {np.array (num_cameras, 3)} -- location of each camera, -R^T t.
+    '''
+    # Rotation vectors are converted directly into the preallocated stack of matrices. The returned
+    # matrix is still stored in case OpenCV did not write into the given slot.
+    rotation_matrices = np.empty((len(rotation_vectors), 3, 3))
+    for icam, rotation_vector in enumerate(rotation_vectors):
+        if rotation_vector is None:
+            rotation_matrices[icam] = np.identity(3) # Assume it's not rotating
+        elif np.shape(rotation_vector) == (3, 3):
+            rotation_matrices[icam] = rotation_vector
+        else:
+            rotation_matrices[icam] = cv2.Rodrigues(
+                np.asarray(rotation_vector, dtype=np.float64), rotation_matrices[icam])[0]
+
+    # Assume there is no translation if not given
+    translation_vectors = np.stack([np.zeros(3) if tvec is None else np.reshape(tvec, 3)
+                                    for tvec in translation_vectors])
 
-    if translation_vector is None:
-        translation_vector = np.zeros((3, 1)) # Assume there is no translation
-    elif translation_vector.shape == (1, 3):
-        translation_vector = np.transpose(translation_vector) # Format
+    # Create the translation vectors, -R^T t for each camera
+    offsets = -np.einsum('nji,nj->ni', rotation_matrices, translation_vectors)
 
-    # Create the translation vector
-    translation_vector = np.matmul(-np.transpose(rotation_vector), translation_vector)
+    return rotation_matrices, offsets
 
-    # Rotate and then translate
-    cam_points = np.transpose(np.matmul(np.transpose(rotation_vector), np.transpose(cam_points)))
-    cam_points = cam_points - np.transpose(translation_vector)
 
-    return cam_points
+def _apply_extrinsics(cam_points, rotation_matrices, offsets):
+    '''Rotates and then translates the Nx3 camera points into the pose of each camera, see
+    _prep_extrinsics. Returns an array (num_cameras, N, 3).'''
+    # Single affine transform per camera, (R^T p^T)^T == p R
+    return np.einsum('pi,nij->npj', cam_points, rotation_matrices) - offsets[:, np.newaxis, :]
 
 
 def get_camera_vertices(cam_points):
@@ -837,19 +1120,12 @@ def get_camera_vertices(cam_points):
     [description]
 
     Arguments:
-        cam_points {list} -- 12-element array.
+        cam_points {np.array 12x3} -- points of the camera, or (num_cameras, 12, 3) for several
+            cameras.
     Output:
-        cam_verts {list 9x4} -- [description]
+        cam_verts {np.array 9x4x3} -- vertices of each face of the camera, (num_cameras, 9, 4, 3)
+            for several cameras.
     '''
-    cam_verts = [
-        [cam_points[0], cam_points[4], cam_points[5], cam_points[1]],
-        [cam_points[1], cam_points[5], cam_points[6], cam_points[2]],
-        [cam_points[2], cam_points[6], cam_points[7], cam_points[3]],
-        [cam_points[3], cam_points[7], cam_points[4], cam_points[0]], # Sides of lenses
-        [cam_points[4], cam_points[8], cam_points[9], cam_points[5]],
-        [cam_points[5], cam_points[9], cam_points[10], cam_points[6]],
-        [cam_points[6], cam_points[10], cam_points[11], cam_points[7]],
-        [cam_points[7], cam_points[11], cam_points[8], cam_points[4]],  # Sides of body
-        [cam_points[8], cam_points[9], cam_points[10], cam_points[11]]]  # Back of body
+    cam_verts = cam_points[..., _CAM_FACE_IDX, :]
 
     return cam_verts
@@ -78,6 +78,7 @@ Important structures:
 """
 
 import os
+import functools
 
 import cv2
 import numpy as np
@@ -111,6 +112,41 @@ def make_projection_matrix(camera_matrix, world_orientation, world_location):
     return projection_matrix
 
 
+def get_optimal_new_camera_matrix(camera_matrix, distortion_coefficients, image_size):
+    '''Computes the camera matrix of the undistorted image that keeps all source pixels.
+
+    Wrapper for cv2.getOptimalNewCameraMatrix with alpha=1 and the same output size. The result only
+    depends on the intrinsics and the image size, so it is computed once and reused afterwards.
+
+    Arguments:
+        camera_matrix {np.array 3x3} -- camera calibration matrix for the camera.
+        distortion_coefficients {np.array} -- distortion coefficients for the camera.
+        image_size {(width, height)} -- size of the images.
+
+    Output:
+        new_camera_matrix {np.array 3x3} -- camera matrix of the undistorted image.
+        roi {tuple (x, y, width, height)} -- region of the undistorted image with valid pixels.
+    '''
+    camera_matrix = np.ascontiguousarray(camera_matrix, dtype=np.float64)
+    distortion_coefficients = np.ascontiguousarray(distortion_coefficients, dtype=np.float64)
+    new_camera_matrix, roi = _cached_optimal_new_camera_matrix(
+        camera_matrix.tobytes(), distortion_coefficients.tobytes(),
+        (int(image_size[0]), int(image_size[1])))
+
+    # Copy so that the cached matrix cannot be changed by the caller
+    return new_camera_matrix.copy(), roi
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_optimal_new_camera_matrix(camera_matrix_bytes, distortion_coefficients_bytes,
+                                      image_size):
+    '''Calls cv2.getOptimalNewCameraMatrix. Arrays are passed as bytes to be hashable.'''
+    camera_matrix = np.frombuffer(camera_matrix_bytes).reshape(3, 3)
+    distortion_coefficients = np.frombuffer(distortion_coefficients_bytes).reshape(1, -1)
+    return cv2.getOptimalNewCameraMatrix(camera_matrix, distortion_coefficients, image_size, 1,
+                                         image_size)
+
+
 def create_board(camera_config, output=False, plotting=False, dpi=300, output_format='pdf',
                  padding=0, target_size=None, dictionary=None):
     '''Creates a board image.
@@ -149,9 +185,6 @@ def create_board(camera_config, output=False, plotting=False, dpi=300, output_fo
 
     dpmm = dpi / 25.4 # Convert inches to mm
 
-    # Make the dictionary
-    total_markers = int(np.floor((board_dim[0] * board_dim[1]) / 2))
-
     # Make the board & array for image
     board_width = (board_dim[0] * check_size)
     board_height = (board_dim[1] * check_size)
@@ -177,20 +210,7 @@ def create_board(camera_config, output=False, plotting=False, dpi=300, output_fo
 
             board_img = np.append(board_img, col, axis=0)
     elif board_type == 'charuco':
-        if dictionary is None:
-            output_dict = cv2.aruco.Dictionary_create(total_markers, 5)
-        else:
-            # if having problems with import of cv2.aruco, uninstall opencv-python and install
-            # opencv-contrib-python, e.g.
-            # pip uninstall opencv-python
-            # pip install opencv-contrib-python
-            custom_dict = cv2.aruco.Dictionary_get(dictionary)
-            output_dict = cv2.aruco.Dictionary_create_from(total_markers, custom_dict.markerSize,
-                                                           custom_dict)
-
-        secondary_length = check_size * 0.6 # What portion of the check the aruco marker takes up
-        output_board = cv2.aruco.CharucoBoard_create(board_dim[0], board_dim[1], check_size/100,
-                                                     secondary_length/100, output_dict)
+        output_dict, output_board = get_charuco_board(camera_config, dictionary=dictionary)
 
         # The board is compiled upside down so the top of the image is actually the bottom,
         # to avoid confusion it's rotated below
@@ -245,6 +265,53 @@ def create_board(camera_config, output=False, plotting=False, dpi=300, output_fo
         return output_dict, output_board, board_img
 
 
+def get_charuco_board(camera_config, dictionary=None):
+    '''Returns the charuco dictionary and board without drawing the board image.
+
+    The dictionary and board are created once for each board description and reused by subsequent
+    calls, so they should not be modified.
+
+    Arguments:
+        camera_config {dict} -- see help(ncams.camera_tools). Should have following keys:
+            board_dim {list with 2 numbers} -- number of checks on the calibration board.
+            check_size {number} -- height and width of a single check mark, mm.
+
+    Keyword Arguments:
+        dictionary {int} -- predefined aruco dictionary to take the markers from, e.g.
+            cv2.aruco.DICT_6X6_250. If None, a dictionary is generated. (default: {None})
+
+    Output:
+        charuco_dict {cv2.aruco.Dictionary} -- dictionary of the markers on the board.
+        charuco_board {cv2.aruco.CharucoBoard} -- the charuco board.
+    '''
+    board_dim = camera_config['board_dim']
+    return _cached_charuco_board(int(board_dim[0]), int(board_dim[1]),
+                                 camera_config['check_size'], dictionary)
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_charuco_board(board_width, board_height, check_size, dictionary):
+    '''Creates the charuco dictionary and board. See get_charuco_board.'''
+    # Make the dictionary
+    total_markers = int(np.floor((board_width * board_height) / 2))
+    if dictionary is None:
+        charuco_dict = cv2.aruco.Dictionary_create(total_markers, 5)
+    else:
+        # if having problems with import of cv2.aruco, uninstall opencv-python and install
+        # opencv-contrib-python, e.g.
+        # pip uninstall opencv-python
+        # pip install opencv-contrib-python
+        custom_dict = cv2.aruco.Dictionary_get(dictionary)
+        charuco_dict = cv2.aruco.Dictionary_create_from(total_markers, custom_dict.markerSize,
+                                                        custom_dict)
+
+    secondary_length = check_size * 0.6 # What portion of the check the aruco marker takes up
+    charuco_board = cv2.aruco.CharucoBoard_create(board_width, board_height, check_size/100,
+                                                  secondary_length/100, charuco_dict)
+
+    return charuco_dict, charuco_board
+
+
 def create_world_points(camera_config):
     '''Creates world points.
 
@@ -269,7 +336,7 @@ def create_world_points(camera_config):
         world_points[:, :2] = np.mgrid[0:board_dim[0]-1, 0:board_dim[1]-1].T.reshape(-1, 2)
         world_points = world_points * check_size
     elif board_type == 'charuco':
-        charuco_board = create_board(camera_config)[1]
+        charuco_board = get_charuco_board(camera_config)[1]
         nc = charuco_board.chessboardCorners.shape[0]
         world_points = charuco_board.chessboardCorners.reshape(nc, 1, 3)
 
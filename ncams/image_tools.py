@@ -17,6 +17,8 @@ from moviepy import editor # A very easy way of using FFMPEG
 import cv2
 from tqdm import tqdm
 
+from . import camera_tools
+
 
 def undistort_video(video_filename, camera_calib_dict, crop_and_resize=False, output_filename=None):
     '''Undistorts every frame in a video based on camera calibration parameters.
@@ -79,9 +81,8 @@ def undistort_image(image, camera_calib_dict, crop_and_resize=False):
         undistorted_image {np.array X Y Color} --  undistorted image array.
     '''
     h, w = image.shape[:2]
-    new_cam_mat, roi = cv2.getOptimalNewCameraMatrix(
-        camera_calib_dict['camera_matrix'], camera_calib_dict['distortion_coefficients'],
-        (w, h), 1, (w, h))
+    new_cam_mat, roi = camera_tools.get_optimal_new_camera_matrix(
+        camera_calib_dict['camera_matrix'], camera_calib_dict['distortion_coefficients'], (w, h))
     undistorted_image = cv2.undistort(
         image, camera_calib_dict['camera_matrix'], camera_calib_dict['distortion_coefficients'],
         None, new_cam_mat)